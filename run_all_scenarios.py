@@ -130,6 +130,7 @@ def run_imperfect_gates_scenario(shots=2048):
         shots=shots
     )
     imperfect_sdc.visualize_error_comparison(comparison, '11', save_fig=True)
+    imperfect_sdc.close()
 
     return results
 